@@ -1,5 +1,6 @@
-from flask import Flask, render_template, jsonify, request, send_from_directory
+from flask import Flask, render_template, request, send_from_directory
 from flask_cors import CORS
+import orjson
 import os
 from calculators import (
     calculate_homeowner_savings,
@@ -13,6 +14,13 @@ app = Flask(__name__)
 CORS(app)
 
 
+def ojsonify(obj, status=200):
+    """jsonify replacement backed by orjson; serializes ndarrays natively."""
+    return app.response_class(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), status=status, mimetype="application/json"
+    )
+
+
 @app.route("/")
 def index():
     """Serve the main dashboard page"""
@@ -25,72 +33,63 @@ def favicon():
     return send_from_directory(os.path.join(app.root_path, "static"), "favicon.svg", mimetype="image/svg+xml")
 
 
+def _handle(calculator):
+    """Parse the request payload once and run a calculator against it."""
+    data = request.get_json(cache=True, silent=True)
+    if data is None:
+        return ojsonify({"error": "invalid JSON payload"}, 400)
+    try:
+        return ojsonify(calculator(data))
+    except Exception as e:
+        return ojsonify({"error": str(e)}, 400)
+
+
 @app.route("/api/calculate/homeowner", methods=["POST"])
 def calculate_homeowner():
     """Calculate homeowner daily savings and energy metrics"""
-    try:
-        data = request.json
-        result = calculate_homeowner_savings(data)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 400
+    return _handle(calculate_homeowner_savings)
 
 
 @app.route("/api/calculate/yearly", methods=["POST"])
 def calculate_yearly():
     """Calculate blended annual savings across different day types"""
-    try:
-        data = request.json
-        result = calculate_yearly_simulation(data)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 400
+    return _handle(calculate_yearly_simulation)
 
 
 @app.route("/api/calculate/rep", methods=["POST"])
 def calculate_rep():
     """Calculate REP value proposition"""
-    try:
-        data = request.json
-        result = calculate_rep_value(data)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 400
+    return _handle(calculate_rep_value)
 
 
 @app.route("/api/calculate/ci", methods=["POST"])
 def calculate_ci():
     """Calculate C&I business value"""
-    try:
-        data = request.json
-        result = calculate_ci_value(data)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 400
+    return _handle(calculate_ci_value)
 
 
 @app.route("/api/calculate/payback", methods=["POST"])
 def calculate_payback():
     """Calculate payback period"""
-    try:
-        data = request.json
-        result = calculate_payback_period(data)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 400
+    return _handle(calculate_payback_period)
 
 
-@app.route("/api/summary/data", methods=["GET"])
-def get_summary_data():
-    """Get summary table data"""
-    # This can be expanded to fetch from database if needed
-    summary_data = {
+# Summary table payload is static, so serialize it once at import time.
+# This can be replaced with a database fetch if needed.
+_SUMMARY_JSON = orjson.dumps(
+    {
         "homeowners": [312500, 625000, 937500],
         "reps": [100000, 100000, 100000],
         "tdu": [9236018, 23350000, 35025000],
         "region": [4700000, 14100000, 14100000],
     }
-    return jsonify(summary_data)
+)
+
+
+@app.route("/api/summary/data", methods=["GET"])
+def get_summary_data():
+    """Get summary table data"""
+    return app.response_class(_SUMMARY_JSON, mimetype="application/json")
 
 
 if __name__ == "__main__":
@@ -14,5 +14,7 @@ echo "📍 Server will be available at: http://localhost:5000"
 echo "🛑 Press Ctrl+C to stop the server"
 echo ""
 
-# Run the Flask application
-python app.py
+# Run the application under gunicorn. --preload imports the app (NumPy,
+# Numba kernel compilation) once before forking so every worker starts hot.
+# For local debugging with auto-reload, use `python app.py` instead.
+gunicorn -w 4 -k gthread --threads 2 --preload -b 0.0.0.0:5000 wsgi:app
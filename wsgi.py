@@ -0,0 +1,6 @@
+"""WSGI entry point for production serving with gunicorn."""
+
+from app import app
+
+if __name__ == "__main__":
+    app.run()